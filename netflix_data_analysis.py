@@ -1,12 +1,12 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
 import plotly.express as px
 import plotly.graph_objects as go
+import pyarrow as pa
 from datetime import datetime
+import os
+from prepare_data import CSV_PATH, PARQUET_PATH, STRING_COLS, prepare_data
 
 # Page configuration
 st.set_page_config(
@@ -46,19 +46,139 @@ st.markdown("""
 # Load and prepare data
 @st.cache_data
 def load_data():
-    df = pd.read_csv('netflix1.csv')
-    data = df.copy()
-    data.drop_duplicates(inplace=True)
+    # Prefer the preprocessed Parquet file unless the CSV has changed since it was written
+    if os.path.exists(PARQUET_PATH) and os.path.getmtime(PARQUET_PATH) >= os.path.getmtime(CSV_PATH):
+        # read_parquet restores text as StringDtype, so cast back to the CSV path's Arrow strings
+        data = pd.read_parquet(PARQUET_PATH).astype({c: pd.ArrowDtype(pa.string()) for c in STRING_COLS})
+    else:
+        data = prepare_data(CSV_PATH)
     
-    # Data preprocessing
-    data['date_added'] = pd.to_datetime(data['date_added'])
-    data['year_added'] = data['date_added'].dt.year
-    data['month_added'] = data['date_added'].dt.month
-    data['genres'] = data['listed_in'].apply(lambda x: x.split(","))
+    data['title_length'] = data['title'].str.len()
+    
+    # Split by content type once so each section reuses the same frames
+    movies_df = data[data['type'] == 'Movie']
+    tv_df = data[data['type'] == 'TV Show']
+    
+    return data, movies_df, tv_df
+
+# Helpers below take the frame from load_data as an underscore argument so
+# Streamlit skips hashing it; that frame only changes when load_data reruns
+@st.cache_data
+def get_genre_counts(_data):
+    return _data['listed_in'].str.split(',').explode().str.strip().value_counts()
+
+@st.cache_data
+def get_time_trends(_data):
+    # One grouped pass over the date columns, sliced into each trend
+    agg = _data.groupby(['year_added', 'month_added', 'type'], observed=True).size()
+    yearly_trend = agg.groupby(level='year_added', observed=True).sum()
+    monthly_trend = agg.groupby(level='month_added', observed=True).sum()
+    yearly_by_type = agg.groupby(level=['year_added', 'type'], observed=True).sum().reset_index(name='count')
+    return yearly_trend, monthly_trend, yearly_by_type
+
+@st.cache_data
+def top_directors(_data, k=15):
+    # The dataset marks missing directors as 'Not Given'; drop placeholders before counting
+    known = ~_data['director'].isin(['Not Given', 'Unknown'])
+    return _data.loc[known, 'director'].value_counts().head(k)
+
+@st.cache_data
+def top_countries(_data, k=15):
+    return _data['country'].value_counts().head(k)
+
+@st.cache_data
+def get_title_length_counts(_df, content_type):
+    # One bincount pass instead of letting Plotly bin the raw lengths;
+    # content_type keys the cache since the per-type frame is not hashed
+    return np.bincount(_df['title_length'].dropna().to_numpy(dtype=np.int64))
+
+@st.cache_data
+def get_title_frequencies(_df, content_type):
+    # wordcloud is only needed by the Word Cloud tab, so it is imported lazily
+    from wordcloud import WordCloud
     
-    return data
+    # Tokenize titles once with WordCloud's own pipeline so the clouds match generate()
+    return WordCloud().process_text(' '.join(_df['title'].dropna()))
+
+@st.cache_data
+def make_wordcloud(freqs, bg, cmap):
+    from wordcloud import WordCloud
+    
+    return WordCloud(
+        width=800,
+        height=400,
+        background_color=bg,
+        colormap=cmap,
+        max_words=100
+    ).generate_from_frequencies(freqs).to_array()
+
+# Chart builders take plain tuples so Streamlit can hash their inputs cheaply
+TYPE_COLORS = {'Movie': '#E50914', 'TV Show': '#221F1F'}
+
+@st.cache_data
+def build_type_pie(labels, values):
+    fig = go.Figure(go.Pie(
+        labels=list(labels),
+        values=list(values),
+        marker=dict(colors=[TYPE_COLORS.get(t) for t in labels]),
+        textposition='inside',
+        textinfo='percent+label'
+    ))
+    fig.update_layout(title="Content Type Distribution")
+    return fig
+
+@st.cache_data
+def build_bar(labels, counts, colorscale, title, xaxis_title, yaxis_title, horizontal=True):
+    marker = dict(color=list(counts), colorscale=colorscale, showscale=True)
+    if horizontal:
+        bar = go.Bar(x=list(counts), y=list(labels), orientation='h', marker=marker)
+    else:
+        bar = go.Bar(x=list(labels), y=list(counts), marker=marker)
+    fig = go.Figure(bar)
+    fig.update_layout(title=title, xaxis_title=xaxis_title, yaxis_title=yaxis_title)
+    return fig
 
-data = load_data()
+@st.cache_data
+def build_yearly_line(years, counts):
+    fig = px.line(
+        x=list(years),
+        y=list(counts),
+        title="Content Added by Year",
+        markers=True
+    )
+    fig.update_layout(xaxis_title="Year", yaxis_title="Number of Titles Added")
+    fig.update_traces(line=dict(color='#E50914', width=3))
+    return fig
+
+@st.cache_data
+def build_type_area(years, types, counts):
+    return px.area(
+        x=list(years),
+        y=list(counts),
+        color=list(types),
+        labels={'x': 'year_added', 'y': 'count', 'color': 'type'},
+        title="Content Growth by Type Over Time",
+        color_discrete_map=TYPE_COLORS
+    )
+
+@st.cache_data
+def build_country_treemap(names, values):
+    return px.treemap(
+        names=list(names),
+        parents=[''] * len(names),
+        values=list(values),
+        title="Content Distribution by Country",
+        color=list(values),
+        color_continuous_scale='RdBu'
+    )
+
+@st.cache_data
+def build_title_length_histogram(counts, title, color):
+    fig = go.Figure(go.Bar(x=list(range(len(counts))), y=list(counts), marker_color=color))
+    fig.update_layout(title=title, xaxis_title="title_length", yaxis_title="count", bargap=0)
+    return fig
+
+data, movies_df, tv_df = load_data()
 
 # Sidebar for filters and navigation
 st.sidebar.image("https://upload.wikimedia.org/wikipedia/commons/0/08/Netflix_2015_logo.svg", width=150)
@@ -81,11 +201,11 @@ if analysis_option == "📊 Overview":
         st.metric("Total Content", f"{total_content:,}")
     
     with col2:
-        movies_count = len(data[data['type'] == 'Movie'])
+        movies_count = len(movies_df)
         st.metric("Movies", f"{movies_count:,}")
     
     with col3:
-        tv_shows_count = len(data[data['type'] == 'TV Show'])
+        tv_shows_count = len(tv_df)
         st.metric("TV Shows", f"{tv_shows_count:,}")
     
     with col4:
@@ -100,28 +220,20 @@ if analysis_option == "📊 Overview":
     with col1:
         # Interactive pie chart
         type_counts = data['type'].value_counts()
-        fig_pie = px.pie(
-            values=type_counts.values,
-            names=type_counts.index,
-            title="Content Type Distribution",
-            color=type_counts.index,
-            color_discrete_map={'Movie': '#E50914', 'TV Show': '#221F1F'}
-        )
-        fig_pie.update_traces(textposition='inside', textinfo='percent+label')
+        fig_pie = build_type_pie(tuple(type_counts.index), tuple(type_counts.values))
         st.plotly_chart(fig_pie, use_container_width=True)
     
     with col2:
         # Rating distribution
         rating_counts = data['rating'].value_counts().head(10)
-        fig_rating = px.bar(
-            x=rating_counts.values,
-            y=rating_counts.index,
-            orientation='h',
-            title="Top 10 Content Ratings",
-            color=rating_counts.values,
-            color_continuous_scale='Reds'
+        fig_rating = build_bar(
+            tuple(rating_counts.index),
+            tuple(rating_counts.values),
+            'Reds',
+            "Top 10 Content Ratings",
+            "Count",
+            "Rating"
         )
-        fig_rating.update_layout(xaxis_title="Count", yaxis_title="Rating")
         st.plotly_chart(fig_rating, use_container_width=True)
 
 # Content Analysis Section
@@ -132,8 +244,7 @@ elif analysis_option == "🎭 Content Analysis":
     st.markdown('<h2 class="section-header">Genre Analysis</h2>', unsafe_allow_html=True)
     
     # Interactive genre selection
-    all_genres = sum(data['genres'], [])
-    genre_counts = pd.Series(all_genres).value_counts()
+    genre_counts = get_genre_counts(data)
     
     col1, col2 = st.columns([2, 1])
     
@@ -141,15 +252,14 @@ elif analysis_option == "🎭 Content Analysis":
         top_n = st.slider("Select number of top genres to display:", 5, 20, 10)
         
         top_genres = genre_counts.head(top_n)
-        fig_genres = px.bar(
-            x=top_genres.values,
-            y=top_genres.index,
-            orientation='h',
-            title=f"Top {top_n} Genres on Netflix",
-            color=top_genres.values,
-            color_continuous_scale='Viridis'
+        fig_genres = build_bar(
+            tuple(top_genres.index),
+            tuple(top_genres.values),
+            'Viridis',
+            f"Top {top_n} Genres on Netflix",
+            "Count",
+            "Genre"
         )
-        fig_genres.update_layout(xaxis_title="Count", yaxis_title="Genre")
         st.plotly_chart(fig_genres, use_container_width=True)
     
     with col2:
@@ -162,47 +272,37 @@ elif analysis_option == "🎭 Content Analysis":
 elif analysis_option == "📈 Trends Over Time":
     st.markdown('<h1 class="main-header">Content Trends Over Time</h1>', unsafe_allow_html=True)
     
+    yearly_trend, monthly_trend, yearly_by_type = get_time_trends(data)
+    
     col1, col2 = st.columns(2)
     
     with col1:
         # Yearly trend
-        yearly_trend = data['year_added'].value_counts().sort_index()
-        fig_yearly = px.line(
-            x=yearly_trend.index,
-            y=yearly_trend.values,
-            title="Content Added by Year",
-            markers=True
-        )
-        fig_yearly.update_layout(xaxis_title="Year", yaxis_title="Number of Titles Added")
-        fig_yearly.update_traces(line=dict(color='#E50914', width=3))
+        fig_yearly = build_yearly_line(tuple(yearly_trend.index), tuple(yearly_trend.values))
         st.plotly_chart(fig_yearly, use_container_width=True)
     
     with col2:
         # Monthly distribution
-        monthly_trend = data['month_added'].value_counts().sort_index()
         months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
                  'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-        fig_monthly = px.bar(
-            x=months,
-            y=monthly_trend.values,
-            title="Content Added by Month",
-            color=monthly_trend.values,
-            color_continuous_scale='Bluered'
+        fig_monthly = build_bar(
+            tuple(months),
+            tuple(monthly_trend.values),
+            'Bluered',
+            "Content Added by Month",
+            "Month",
+            "Number of Titles Added",
+            horizontal=False
         )
-        fig_monthly.update_layout(xaxis_title="Month", yaxis_title="Number of Titles Added")
         st.plotly_chart(fig_monthly, use_container_width=True)
     
     # Interactive time series by type
     st.markdown('<h3 class="section-header">Content Growth by Type</h3>', unsafe_allow_html=True)
     
-    yearly_by_type = data.groupby(['year_added', 'type']).size().reset_index(name='count')
-    fig_trend_type = px.area(
-        yearly_by_type,
-        x='year_added',
-        y='count',
-        color='type',
-        title="Content Growth by Type Over Time",
-        color_discrete_map={'Movie': '#E50914', 'TV Show': '#221F1F'}
+    fig_trend_type = build_type_area(
+        tuple(yearly_by_type['year_added']),
+        tuple(yearly_by_type['type']),
+        tuple(yearly_by_type['count'])
     )
     st.plotly_chart(fig_trend_type, use_container_width=True)
 
@@ -211,32 +311,23 @@ elif analysis_option == "👥 Directors & Creators":
     st.markdown('<h1 class="main-header">Directors & Content Creators</h1>', unsafe_allow_html=True)
     
     # Top directors
-    director_counts = data['director'].value_counts().head(15)
-    director_counts = director_counts[director_counts.index != 'Unknown']
-    
-    fig_directors = px.bar(
-        x=director_counts.values,
-        y=director_counts.index,
-        orientation='h',
-        title="Top Directors on Netflix",
-        color=director_counts.values,
-        color_continuous_scale='Hot'
+    director_counts = top_directors(data)
+    
+    fig_directors = build_bar(
+        tuple(director_counts.index),
+        tuple(director_counts.values),
+        'Hot',
+        "Top Directors on Netflix",
+        "Number of Titles",
+        "Director"
     )
-    fig_directors.update_layout(xaxis_title="Number of Titles", yaxis_title="Director")
     st.plotly_chart(fig_directors, use_container_width=True)
     
     # Country analysis
     st.markdown('<h3 class="section-header">Content by Country</h3>', unsafe_allow_html=True)
     
-    country_data = data['country'].value_counts().head(15)
-    fig_country = px.treemap(
-        names=country_data.index,
-        parents=[''] * len(country_data),
-        values=country_data.values,
-        title="Content Distribution by Country",
-        color=country_data.values,
-        color_continuous_scale='RdBu'
-    )
+    country_data = top_countries(data)
+    fig_country = build_country_treemap(tuple(country_data.index), tuple(country_data.values))
     st.plotly_chart(fig_country, use_container_width=True)
 
 # Word Cloud Analysis Section
@@ -247,61 +338,38 @@ elif analysis_option == "🔍 Word Cloud Analysis":
     
     with col1:
         st.markdown("### Movie Titles Word Cloud")
-        movie_titles = data[data['type'] == 'Movie']['title'].dropna()
+        movie_freqs = get_title_frequencies(movies_df, 'Movie')
         
-        if len(movie_titles) > 0:
-            wordcloud_movie = WordCloud(
-                width=800,
-                height=400,
-                background_color='black',
-                colormap='Reds',
-                max_words=100
-            ).generate(' '.join(movie_titles))
-            
-            fig_movie, ax = plt.subplots(figsize=(10, 5))
-            ax.imshow(wordcloud_movie, interpolation='bilinear')
-            ax.axis('off')
-            st.pyplot(fig_movie)
+        if movie_freqs:
+            wordcloud_movie = make_wordcloud(movie_freqs, 'black', 'Reds')
+            st.image(wordcloud_movie, use_container_width=True)
     
     with col2:
         st.markdown("### TV Show Titles Word Cloud")
-        tv_titles = data[data['type'] == 'TV Show']['title'].dropna()
+        tv_freqs = get_title_frequencies(tv_df, 'TV Show')
         
-        if len(tv_titles) > 0:
-            wordcloud_tv = WordCloud(
-                width=800,
-                height=400,
-                background_color='white',
-                colormap='Blues',
-                max_words=100
-            ).generate(' '.join(tv_titles))
-            
-            fig_tv, ax = plt.subplots(figsize=(10, 5))
-            ax.imshow(wordcloud_tv, interpolation='bilinear')
-            ax.axis('off')
-            st.pyplot(fig_tv)
+        if tv_freqs:
+            wordcloud_tv = make_wordcloud(tv_freqs, 'white', 'Blues')
+            st.image(wordcloud_tv, use_container_width=True)
     
     # Additional insights
     st.markdown("### Title Length Analysis")
-    data['title_length'] = data['title'].str.len()
     
     col1, col2 = st.columns(2)
     
     with col1:
-        fig_length_movie = px.histogram(
-            data[data['type'] == 'Movie'],
-            x='title_length',
-            title="Movie Title Length Distribution",
-            color_discrete_sequence=['#E50914']
+        fig_length_movie = build_title_length_histogram(
+            tuple(get_title_length_counts(movies_df, 'Movie')),
+            "Movie Title Length Distribution",
+            '#E50914'
         )
         st.plotly_chart(fig_length_movie, use_container_width=True)
     
     with col2:
-        fig_length_tv = px.histogram(
-            data[data['type'] == 'TV Show'],
-            x='title_length',
-            title="TV Show Title Length Distribution",
-            color_discrete_sequence=['#221F1F']
+        fig_length_tv = build_title_length_histogram(
+            tuple(get_title_length_counts(tv_df, 'TV Show')),
+            "TV Show Title Length Distribution",
+            '#221F1F'
         )
         st.plotly_chart(fig_length_tv, use_container_width=True)
 